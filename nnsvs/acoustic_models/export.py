@@ -0,0 +1,179 @@
+import inspect
+
+import numpy as np
+import torch
+from nnsvs.acoustic_models.multistream import (
+    MDNMultistreamSeparateF0MelModel,
+    MultistreamSeparateF0MelModel,
+    MultistreamSeparateF0ParametricModel,
+    NPSSMDNMultistreamParametricModel,
+    NPSSMultistreamParametricModel,
+)
+from torch import nn
+
+__all__ = ["export_onnx"]
+
+# Models that provide a teacher-forcing-free inference path (``_forward_infer``)
+_MULTISTREAM_MODELS = (
+    MultistreamSeparateF0ParametricModel,
+    NPSSMultistreamParametricModel,
+    NPSSMDNMultistreamParametricModel,
+    MultistreamSeparateF0MelModel,
+    MDNMultistreamSeparateF0MelModel,
+)
+
+
+class _InferenceWrapper(nn.Module):
+    """Pure-inference view of an acoustic model for graph export
+
+    Multi-stream models are called through their inference path so that the exported
+    graph contains no teacher-forcing branch. Other models are called through
+    :py:meth:`inference`.
+
+    NOTE: multi-stream models are called without the padding done by
+    :py:func:`nnsvs.acoustic_models.util.pad_inference`, so the number of frames
+    must be a multiple of the reduction factor.
+    """
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, x, lengths):
+        if isinstance(self.model, _MULTISTREAM_MODELS):
+            out = self.model._forward_infer(x, lengths)[0]
+        else:
+            out = self.model.inference(x, lengths)
+            # MDN: (mu, sigma)
+            if isinstance(out, tuple):
+                out = out[0]
+        # Multiple output: (out, out_fine)
+        if isinstance(out, list):
+            out = out[-1]
+        return out
+
+
+def export_onnx(
+    model, f, in_dim=None, num_frames=100, opset_version=17, check=True, atol=1e-4
+):
+    """Export an acoustic model to ONNX for inference
+
+    The exported graph takes input features ``x`` of shape (B, T, in_dim) and
+    ``lengths`` of shape (B,), and returns output features of shape (B, T, out_dim).
+    Batch and time axes are dynamic. For models with ``reduction_factor > 1``, the
+    number of frames of the inputs must be a multiple of the reduction factor; pad
+    the inputs before running the exported graph.
+
+    The exported model can be run by ONNX Runtime. TensorRT and CUDA execution
+    providers are used if available:
+
+    .. code-block::
+
+        import onnxruntime as ort
+
+        sess = ort.InferenceSession(
+            "acoustic.onnx",
+            providers=[
+                "TensorrtExecutionProvider",
+                "CUDAExecutionProvider",
+                "CPUExecutionProvider",
+            ],
+        )
+        inputs = {"x": x, "lengths": lengths}
+        # NOTE: lengths is pruned from the graph if no submodule depends on it
+        feed = {i.name: inputs[i.name] for i in sess.get_inputs()}
+        out = sess.run(None, feed)[0]
+
+    If ONNX Runtime is installed and ``check`` is True, the exported graph is run
+    with a batch size and a number of frames that differ from the traced ones, and
+    a RuntimeError is raised if the outputs do not match PyTorch's ones. This
+    catches submodules that bake the traced shapes into the graph.
+
+    If the whole model cannot be exported because of an unsupported operator,
+    consider exporting the largest stream model (e.g., ``model.mel_model`` or
+    ``model.mgc_model``) alone by specifying its input dimension.
+
+    Args:
+        model (nn.Module): Acoustic model to export.
+        f (str): Path to the output ONNX file.
+        in_dim (int): Input dimension. Defaults to ``model.in_dim``.
+        num_frames (int): Number of frames of the dummy input used for tracing. Must
+            be a multiple of the reduction factor of the model.
+        opset_version (int): ONNX opset version.
+        check (bool): Verify the exported graph with ONNX Runtime if available.
+        atol (float): Absolute tolerance used by the check.
+
+    Raises:
+        RuntimeError: If the exported graph does not reproduce PyTorch's outputs.
+    """
+    if in_dim is None:
+        in_dim = model.in_dim
+    reduction_factor = getattr(model, "reduction_factor", 1)
+    assert (
+        num_frames % reduction_factor == 0
+    ), f"num_frames must be a multiple of the reduction factor ({reduction_factor})"
+    was_training = model.training
+    model.eval()
+
+    device = next(model.parameters()).device
+    dummy_x = torch.zeros(1, num_frames, in_dim, device=device)
+    dummy_lengths = torch.tensor([num_frames], dtype=torch.long)
+
+    kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        # NOTE: the model is traced by the TorchScript-based exporter since
+        # some submodules compute shapes from lengths at runtime
+        kwargs["dynamo"] = False
+
+    try:
+        with torch.no_grad():
+            torch.onnx.export(
+                _InferenceWrapper(model),
+                (dummy_x, dummy_lengths),
+                f,
+                input_names=["x", "lengths"],
+                output_names=["out"],
+                dynamic_axes={
+                    "x": {0: "B", 1: "T"},
+                    "lengths": {0: "B"},
+                    "out": {0: "B", 1: "T"},
+                },
+                opset_version=opset_version,
+                **kwargs,
+            )
+        if check:
+            _check_onnx(model, f, in_dim, num_frames, device, atol)
+    finally:
+        model.train(was_training)
+
+
+def _check_onnx(model, f, in_dim, num_frames, device, atol):
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        return
+
+    # NOTE: use a batch size and a number of frames different from the traced ones
+    # so that axes that were not exported as dynamic are detected
+    B, T = 2, num_frames * 2
+    x = torch.rand(B, T, in_dim)
+    lengths = torch.tensor([T, T // 2], dtype=torch.long)
+    with torch.no_grad():
+        expected = _InferenceWrapper(model)(x.to(device), lengths).cpu().numpy()
+
+    sess = ort.InferenceSession(str(f), providers=["CPUExecutionProvider"])
+    inputs = {"x": x.numpy(), "lengths": lengths.numpy()}
+    feed = {i.name: inputs[i.name] for i in sess.get_inputs()}
+    try:
+        out = sess.run(None, feed)[0]
+    except Exception as e:
+        raise RuntimeError(
+            f"The exported ONNX model failed to run with input shape {(B, T, in_dim)}. "
+            "Some submodules may not support dynamic batch or time axes."
+        ) from e
+    if out.shape != expected.shape or not np.allclose(out, expected, atol=atol):
+        raise RuntimeError(
+            f"Outputs of the exported ONNX model do not match PyTorch's ones for "
+            f"input shape {(B, T, in_dim)}. Some submodules may bake the traced "
+            "shapes into the graph."
+        )
@@ -1,8 +1,13 @@
+import contextlib
+from collections import OrderedDict
+from functools import reduce
+
+import numpy as np
 import torch
 from nnsvs.acoustic_models.util import pad_inference
 from nnsvs.base import BaseModel, PredictionType
-from nnsvs.multistream import split_streams
 from torch import nn
+from torch.nn import functional as F
 
 __all__ = [
     "MultistreamSeparateF0ParametricModel",
@@ -13,7 +18,439 @@ __all__ = [
 ]
 
 
-class MultistreamSeparateF0ParametricModel(BaseModel):
+def _stream_offsets(stream_sizes):
+    """Compute the start offset of each stream followed by the total size
+
+    Args:
+        stream_sizes (list): List of stream sizes.
+
+    Returns:
+        tuple: stream offsets
+    """
+    return tuple(int(o) for o in np.cumsum([0] + list(stream_sizes)))
+
+
+def _is_reusable_call(model, device):
+    """Check whether intermediate results can be reused across calls of a model
+
+    Results are reused only for inference (eval mode with autograd disabled). They
+    are never reused while tracing (e.g., ONNX export) or capturing CUDA graphs,
+    since the reused memory would be baked into the traced or captured graph.
+
+    Args:
+        model (nn.Module): Multi-stream model.
+        device (torch.device): Device of the inputs.
+
+    Returns:
+        bool: True if results can be reused
+    """
+    return not (
+        model.training
+        or torch.is_grad_enabled()
+        or torch.jit.is_tracing()
+        or (device.type == "cuda" and torch.cuda.is_current_stream_capturing())
+    )
+
+
+def _reusable_buffer(owner, name, shape, dtype, device):
+    """Get a contiguous view of a reusable buffer of a module
+
+    The buffer is a flat storage that is reallocated if it is too small for the
+    requested shape or if its data type or device differs.
+
+    Args:
+        owner (nn.Module): Module that holds the buffer.
+        name (str): Name of the buffer.
+        shape (tuple): Shape of the view.
+        dtype (torch.dtype): Data type of the view.
+        device (torch.device): Device of the view.
+
+    Returns:
+        torch.Tensor: contiguous view of the buffer
+    """
+    numel = int(np.prod(shape))
+    buf = getattr(owner, name)
+    if (
+        buf.numel() < numel
+        or buf.dtype != dtype
+        or buf.device != device
+        # NOTE: inference tensors cannot be updated outside inference mode
+        or (buf.is_inference() and not torch.is_inference_mode_enabled())
+    ):
+        buf = torch.empty(numel, dtype=dtype, device=device)
+        setattr(owner, name, buf)
+    return buf[:numel].view(shape)
+
+
+def _output_buffer(owner, shape, dtype, device):
+    """Get a view of the reusable output buffer of a multi-stream model
+
+    The buffer is reused only if :py:func:`_is_reusable_call` allows it, and grown
+    if it is too small for the requested shape.
+
+    Args:
+        owner (nn.Module): Module that holds the output buffer.
+        shape (tuple): Shape of the output.
+        dtype (torch.dtype): Data type of the output.
+        device (torch.device): Device of the output.
+
+    Returns:
+        torch.Tensor: contiguous view of the buffer, or None if the buffer cannot
+        be used.
+    """
+    if owner is None or not owner.reuse_output_buffer:
+        return None
+    if not _is_reusable_call(owner, device):
+        return None
+    return _reusable_buffer(owner, "_out_buf", shape, dtype, device)
+
+
+def _cat_streams(streams, buffer_owner=None):
+    """Concatenate streams along the last axis
+
+    Args:
+        streams (list): List of tensors of shape (B, T, C_i).
+        buffer_owner (nn.Module): If given, the output is written into the reusable
+            output buffer of the module when possible.
+
+    Returns:
+        torch.Tensor: concatenated tensor of shape (B, T, sum(C_i))
+    """
+    out = None
+    if buffer_owner is not None:
+        B, T = streams[0].shape[:2]
+        dtype = reduce(torch.promote_types, [s.dtype for s in streams])
+        size = sum(s.shape[-1] for s in streams)
+        out = _output_buffer(buffer_owner, (B, T, size), dtype, streams[0].device)
+    if out is None:
+        return torch.cat(streams, dim=-1)
+    return torch.cat(streams, dim=-1, out=out)
+
+
+def _cat_stream_outputs(model, streams):
+    """Concatenate the outputs of the stream models of a multi-stream model
+
+    Stream models with a postnet return a list of outputs (e.g., before and after
+    the postnet). Every output is normalized to a list so that the outputs are
+    concatenated in a single loop; a stream with a single output is reused for all
+    the concatenated outputs.
+
+    Args:
+        model (nn.Module): Multi-stream model.
+        streams (list): Outputs of the stream models in the stream order.
+
+    Returns:
+        torch.Tensor or list: concatenated output, or list of concatenated outputs
+        if any of the stream models has a postnet.
+    """
+    stream_lists = [s if isinstance(s, list) else [s] for s in streams]
+    has_postnet_output = any(isinstance(s, list) for s in streams)
+    num_outputs = max(len(s) for s in stream_lists)
+
+    outs = []
+    for idx in range(num_outputs):
+        out = _cat_streams(
+            [s[min(idx, len(s) - 1)] for s in stream_lists],
+            # NOTE: only the final output is written into the reusable buffer
+            model if idx == num_outputs - 1 else None,
+        )
+        if model.strict_shape_check:
+            assert out.shape[-1] == model.out_dim
+        outs.append(out)
+
+    return outs if has_postnet_output else outs[0]
+
+
+def _run_in_parallel(owner, fns, device):
+    """Run independent computations on separate CUDA streams
+
+    Computations are run sequentially on the current stream for non-CUDA devices.
+    This is only used for inference; training runs the stream models sequentially
+    so that the backward pass stays on a single stream.
+
+    Args:
+        owner (nn.Module): Module that holds the CUDA streams.
+        fns (list): List of callables that take no arguments.
+        device (torch.device): Device of the inputs.
+
+    Returns:
+        list: outputs of the callables
+    """
+    if device.type != "cuda":
+        return [fn() for fn in fns]
+
+    streams = owner._cuda_streams
+    if streams is None or len(streams) < len(fns) or streams[0].device != device:
+        streams = [torch.cuda.Stream(device=device) for _ in fns]
+        owner._cuda_streams = streams
+
+    current_stream = torch.cuda.current_stream(device)
+    outs = []
+    for stream, fn in zip(streams, fns):
+        # Wait for the inputs to be ready
+        stream.wait_stream(current_stream)
+        with torch.cuda.stream(stream):
+            outs.append(fn())
+    for stream in streams[: len(fns)]:
+        current_stream.wait_stream(stream)
+
+    return outs
+
+
+def _cuda_graph_num_frames(num_frames, reduction_factor):
+    """Round up the number of frames to a bucket for CUDA graph capture
+
+    Buckets are spaced by a quarter of the largest power of two not exceeding the
+    number of frames, rounded up to a multiple of the reduction factor. Inputs are
+    padded by less than a quarter of the frames plus the reduction factor, and
+    segments of similar lengths share a captured graph.
+
+    Args:
+        num_frames (int): Number of frames.
+        reduction_factor (int): Reduction factor of the model.
+
+    Returns:
+        int: number of frames of the bucket
+    """
+    step = max(1, (1 << (max(num_frames, 1).bit_length() - 1)) // 4)
+    step = -(-step // reduction_factor) * reduction_factor
+    return -(-num_frames // step) * step
+
+
+def _getstate_without_runtime_state(self):
+    """Get the picklable state of a multi-stream model
+
+    CUDA streams and captured CUDA graphs are bound to the running process, so they
+    are dropped and created again lazily after unpickling.
+    """
+    state = dict(nn.Module.__getstate__(self))
+    if "_cuda_streams" in state:
+        state["_cuda_streams"] = None
+    if "_cuda_graphs" in state:
+        state["_cuda_graphs"] = OrderedDict()
+        state["_cuda_graph_params"] = None
+    return state
+
+
+_AUTOCAST_DTYPES = {"fp16": torch.float16, "bf16": torch.bfloat16}
+
+
+def _autocast(model, x):
+    """Get the autocast context for the inference of a multi-stream model
+
+    Args:
+        model (nn.Module): Multi-stream model.
+        x (torch.Tensor): Input features.
+
+    Returns:
+        context manager: autocast context, or a null context for fp32 inference
+    """
+    # NOTE: dynamically quantized layers do not accept half-precision inputs
+    if model.precision == "fp32" or model._quantized:
+        return contextlib.nullcontext()
+    dtype = _AUTOCAST_DTYPES[model.precision]
+    # Use bf16 for devices other than CUDA (e.g., CPUs with AMX)
+    if x.device.type != "cuda":
+        dtype = torch.bfloat16
+    # NOTE: captured CUDA graphs must not read the cached casts of the weights,
+    # which are freed when the autocast context exits
+    cache_enabled = not getattr(model, "cuda_graph", False)
+    return torch.autocast(
+        device_type=x.device.type, dtype=dtype, cache_enabled=cache_enabled
+    )
+
+
+def _cast_outputs(outs, dtype):
+    """Cast (possibly nested) model outputs of floating point types
+
+    Args:
+        outs (torch.Tensor, list or tuple): Model outputs.
+        dtype (torch.dtype): Data type to cast to.
+
+    Returns:
+        cast outputs of the same structure
+    """
+    if isinstance(outs, torch.Tensor):
+        return outs.to(dtype) if outs.is_floating_point() else outs
+    if isinstance(outs, (list, tuple)):
+        return type(outs)(_cast_outputs(o, dtype) for o in outs)
+    return outs
+
+
+def _quantize_submodules(model, names):
+    """Apply int8 dynamic quantization to the stream models of a multi-stream model
+
+    Linear and RNN layers are quantized in-place. The model must be in eval mode
+    and on CPU. Submodules with ``_disable_quant = True`` (e.g., MDN layers whose
+    outputs are sensitive to the precision) are left as is.
+
+    Args:
+        model (nn.Module): Multi-stream model.
+        names (list): Attribute names of the stream models.
+    """
+    if model._quantized:
+        return
+    if model.training:
+        raise RuntimeError("Quantization is only supported in eval mode")
+    if any(p.device.type != "cpu" for p in model.parameters()):
+        raise RuntimeError("Quantization is only supported on CPU")
+    qconfig = torch.ao.quantization.default_dynamic_qconfig
+    for name in names:
+        module = getattr(model, name)
+        if module is None:
+            continue
+        disabled = [
+            n for n, m in module.named_modules() if getattr(m, "_disable_quant", False)
+        ]
+        qconfig_spec = {
+            n: qconfig
+            for n, m in module.named_modules()
+            if isinstance(m, (nn.Linear, nn.LSTM, nn.GRU))
+            and not any(n == d or n.startswith(d + ".") or d == "" for d in disabled)
+        }
+        if len(qconfig_spec) == 0:
+            continue
+        torch.ao.quantization.quantize_dynamic(
+            module, qconfig_spec, dtype=torch.qint8, inplace=True
+        )
+    model._quantized = True
+
+
+# NOTE: out_lf0_idx and in_lf0_idx are not propagated to the residual F0 model
+_LF0_PARAMS = ("in_lf0_min", "in_lf0_max", "out_lf0_mean", "out_lf0_scale")
+
+
+def _lf0_param(name):
+    """Property for an lf0 normalization parameter of a multi-stream model
+
+    The value is propagated to the residual F0 prediction model on assignment, so
+    that the stream model sees the parameters updated after construction (e.g., by
+    the training script).
+
+    Args:
+        name (str): Name of the parameter.
+
+    Returns:
+        property: Property that forwards assignments to ``lf0_model``.
+    """
+    attr = "_" + name
+
+    def fget(self):
+        try:
+            return self.__dict__[attr]
+        except KeyError:
+            # NOTE: hasattr() relies on AttributeError
+            raise AttributeError(name) from None
+
+    def fset(self, value):
+        self.__dict__[attr] = value
+        # NOTE: don't overwrite out_lf0_idx and in_lf0_idx
+        if self._has_residual_lf0_model:
+            setattr(self.lf0_model, name, value)
+
+    return property(fget, fset)
+
+
+class MultistreamBaseModel(BaseModel):
+    """Base class of the multi-stream models
+
+    Holds the serving options and the lf0 normalization parameters shared by the
+    multi-stream models.
+
+    :py:meth:`inference` runs under :py:func:`torch.inference_mode`, so its outputs
+    are inference tensors. They cannot be modified in-place outside inference mode
+    (e.g., ``y[:, :, 0] = 0`` raises an error); clone them first if needed.
+
+    Args:
+        quantize (bool): If True, the stream models are quantized to int8 by
+            :py:meth:`quantize_` when the model is loaded for serving on CPU.
+        strict_shape_check (bool): If True, check the feature dimensions of the inputs
+            and outputs at every forward. Can be disabled for serving.
+        reuse_output_buffer (bool): If True, outputs computed with autograd disabled
+            are written into a buffer that is reused across calls. The returned
+            tensor is overwritten by the next call, so callers must copy it if it
+            needs to be kept (note that ``.cpu().numpy()`` shares memory on CPU).
+            The buffer is not thread-safe; do not call the model concurrently.
+        precision (str): Precision of inference; "fp32", "fp16" or "bf16". Half
+            precision runs the stream models under autocast (bf16 is used on devices
+            other than CUDA) and the outputs are cast back to the input dtype.
+    """
+
+    in_lf0_min = _lf0_param("in_lf0_min")
+    in_lf0_max = _lf0_param("in_lf0_max")
+    out_lf0_mean = _lf0_param("out_lf0_mean")
+    out_lf0_scale = _lf0_param("out_lf0_scale")
+
+    # Stream models quantized by quantize_; set by subclasses
+    QUANTIZABLE_MODELS = ()
+
+    __getstate__ = _getstate_without_runtime_state
+
+    def __init__(
+        self,
+        quantize=False,
+        strict_shape_check=True,
+        reuse_output_buffer=False,
+        precision="fp32",
+    ):
+        super().__init__()
+        self.quantize = quantize
+        self._quantized = False
+        self.strict_shape_check = strict_shape_check
+        self.reuse_output_buffer = reuse_output_buffer
+        assert precision in ["fp32", "fp16", "bf16"]
+        self.precision = precision
+        # Reusable storage for the concatenated outputs; grown on demand
+        self.register_buffer("_out_buf", torch.empty(0), persistent=False)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name == "lf0_model":
+            # lf0 params are propagated to the residual F0 prediction model, including
+            # the one assigned after construction
+            self._has_residual_lf0_model = hasattr(value, "out_lf0_mean")
+            if self._has_residual_lf0_model:
+                for param in _LF0_PARAMS:
+                    if "_" + param in self.__dict__:
+                        setattr(value, param, getattr(self, param))
+
+    def has_residual_lf0_prediction(self):
+        return True
+
+    def quantize_(self):
+        """Quantize the stream models to int8 in-place for serving on CPU
+
+        This must be called after the checkpoint has been loaded since the keys of
+        the state dict are changed. The model must not be trained afterwards.
+        """
+        _quantize_submodules(self, self.QUANTIZABLE_MODELS)
+
+    def forward(self, x, lengths=None, y=None):
+        if self.strict_shape_check:
+            assert x.shape[-1] == self.in_dim
+
+        if y is None:
+            return self._forward_infer(x, lengths)
+        return self._forward_train(x, lengths, y)
+
+    def inference(self, x, lengths=None):
+        with torch.inference_mode(), _autocast(self, x):
+            out = self._inference(x, lengths)
+        if self.precision != "fp32":
+            out = _cast_outputs(out, x.dtype)
+        return out
+
+    def _inference(self, x, lengths):
+        return pad_inference(
+            model=self,
+            x=x,
+            lengths=lengths,
+            reduction_factor=self.reduction_factor,
+            mdn=self.prediction_type() == PredictionType.MULTISTREAM_HYBRID,
+        )
+
+
+class MultistreamSeparateF0ParametricModel(MultistreamBaseModel):
     """Multi-stream model with a separate F0 prediction model
 
     acoustic features: [MGC, LF0, VUV, BAP]
@@ -41,8 +478,27 @@ class MultistreamSeparateF0ParametricModel(BaseModel):
         out_lf0_mean (float): mean of lf0 in the training data of output features
         out_lf0_scale (float): scale of lf0 in the training data of output features
         lf0_teacher_forcing (bool): Whether to use teacher forcing for F0 prediction.
+        cuda_graph (bool): If True, :py:meth:`inference` on CUDA is captured and
+            replayed as CUDA graphs, one graph per input shape. All submodules must be
+            capturable (e.g., no host-device synchronization in their forward).
+        cuda_graph_bucketing (bool): If True, inputs are padded to bucketed numbers
+            of frames (by replicating the last frame, as done for the reduction
+            factor) so that segments of similar lengths share a graph. The padded
+            frames are treated as valid frames, so the outputs differ from those of
+            the eager inference for non-causal stream models (e.g., bidirectional
+            LSTMs, self-attention and convolutions). Keep it False for such models.
+        max_cuda_graphs (int): Maximum number of captured CUDA graphs to keep. The
+            least recently used graph is released first.
+        **kwargs: Serving options (``quantize``, ``strict_shape_check``,
+            ``reuse_output_buffer`` and ``precision``). See
+            :py:class:`~nnsvs.acoustic_models.multistream.MultistreamBaseModel`.
     """
 
+    # Number of streams: [MGC, LF0, VUV, BAP]
+    NUM_STREAMS = 4
+    # Stream models quantized by quantize_
+    QUANTIZABLE_MODELS = ("lf0_model", "mgc_model", "vuv_model", "bap_model")
+
     def __init__(
         self,
         in_dim: int,
@@ -65,15 +521,23 @@ class MultistreamSeparateF0ParametricModel(BaseModel):
         out_lf0_mean=5.953093881972361,
         out_lf0_scale=0.23435173188961034,
         lf0_teacher_forcing=True,
+        cuda_graph=False,
+        cuda_graph_bucketing=False,
+        max_cuda_graphs=8,
+        **kwargs,
     ):
-        super().__init__()
+        super().__init__(**kwargs)
         self.in_dim = in_dim
         self.out_dim = out_dim
         self.stream_sizes = stream_sizes
+        self._split_points = _stream_offsets(stream_sizes)[1:-1]
         self.reduction_factor = reduction_factor
         self.lf0_teacher_forcing = lf0_teacher_forcing
+        self.cuda_graph = cuda_graph
+        self.cuda_graph_bucketing = cuda_graph_bucketing
+        self.max_cuda_graphs = max_cuda_graphs
 
-        assert len(stream_sizes) in [4]
+        assert len(stream_sizes) == self.NUM_STREAMS
 
         self.encoder = encoder
         if self.encoder is not None:
@@ -89,89 +553,155 @@ class MultistreamSeparateF0ParametricModel(BaseModel):
         self.out_lf0_idx = out_lf0_idx
         self.out_lf0_mean = out_lf0_mean
         self.out_lf0_scale = out_lf0_scale
-
-    def has_residual_lf0_prediction(self):
-        return True
-
-    def _set_lf0_params(self):
-        # Special care for residual F0 prediction models
-        # NOTE: don't overwrite out_lf0_idx and in_lf0_idx
-        if hasattr(self.lf0_model, "out_lf0_mean"):
-            self.lf0_model.in_lf0_min = self.in_lf0_min
-            self.lf0_model.in_lf0_max = self.in_lf0_max
-            self.lf0_model.out_lf0_mean = self.out_lf0_mean
-            self.lf0_model.out_lf0_scale = self.out_lf0_scale
-
-    def is_autoregressive(self):
-        return (
+        # CUDA streams for the decoders; created lazily
+        self._cuda_streams = None
+        # (input shape, dtype, lengths, precision) -> (graph, static input, static outputs)
+        # in least recently used order
+        self._cuda_graphs = OrderedDict()
+        # Data pointers of the parameters at capture
+        self._cuda_graph_params = None
+        # NOTE: the model topology is fixed after construction
+        self._is_autoregressive = (
             self.mgc_model.is_autoregressive()
             or self.lf0_model.is_autoregressive()
             or self.vuv_model.is_autoregressive()
             or self.bap_model.is_autoregressive()
         )
 
-    def forward(self, x, lengths=None, y=None):
-        self._set_lf0_params()
-        assert x.shape[-1] == self.in_dim
+    def is_autoregressive(self):
+        return self._is_autoregressive
 
-        if y is not None:
-            # Teacher-forcing
-            y_mgc, y_lf0, y_vuv, y_bap = split_streams(y, self.stream_sizes)
-        else:
-            # Inference
-            y_mgc, y_lf0, y_vuv, y_bap = None, None, None, None
+    def clear_cuda_graphs(self):
+        """Release the captured CUDA graphs"""
+        self._cuda_graphs.clear()
+        self._cuda_graph_params = None
+
+    def _apply(self, fn, *args, **kwargs):
+        # NOTE: captured graphs refer to the memory of the parameters
+        self.clear_cuda_graphs()
+        return super()._apply(fn, *args, **kwargs)
+
+    def _forward_train(self, x, lengths, y):
+        # Teacher-forcing
+        y_mgc, y_lf0, y_vuv, y_bap = torch.tensor_split(y, self._split_points, dim=-1)
 
         # Predict continuous log-F0 first
         lf0, lf0_residual = self.lf0_model(x, lengths, y_lf0)
 
-        if self.encoder is not None:
-            encoder_outs = self.encoder(x, lengths)
-            # Concat log-F0, rest flags and the outputs of the encoder
-            # This may make the decoder to be aware of the input F0
-            rest_flags = x[:, :, self.in_rest_idx].unsqueeze(-1)
-            if self.lf0_teacher_forcing and y is not None:
-                encoder_outs = torch.cat([encoder_outs, rest_flags, y_lf0], dim=-1)
-            else:
-                encoder_outs = torch.cat([encoder_outs, rest_flags, lf0], dim=-1)
+        if self.lf0_teacher_forcing:
+            encoder_outs = self._encode(x, lengths, y_lf0)
         else:
-            encoder_outs = x
+            encoder_outs = self._encode(x, lengths, lf0)
 
         # Decoders for each stream
         mgc = self.mgc_model(encoder_outs, lengths, y_mgc)
         vuv = self.vuv_model(encoder_outs, lengths, y_vuv)
         bap = self.bap_model(encoder_outs, lengths, y_bap)
 
-        # make a concatenated stream
-        has_postnet_output = (
-            isinstance(mgc, list)
-            or isinstance(lf0, list)
-            or isinstance(vuv, list)
-            or isinstance(bap, list)
-        )
-        if has_postnet_output:
-            outs = []
-            for idx in range(len(mgc)):
-                mgc_ = mgc[idx] if isinstance(mgc, list) else mgc
-                lf0_ = lf0[idx] if isinstance(lf0, list) else lf0
-                vuv_ = vuv[idx] if isinstance(vuv, list) else vuv
-                bap_ = bap[idx] if isinstance(bap, list) else bap
-                out = torch.cat([mgc_, lf0_, vuv_, bap_], dim=-1)
-                assert out.shape[-1] == self.out_dim
-                outs.append(out)
-            return outs, lf0_residual
-        else:
-            out = torch.cat([mgc, lf0, vuv, bap], dim=-1)
-            assert out.shape[-1] == self.out_dim
+        return self._make_outputs(mgc, lf0, vuv, bap), lf0_residual
 
-        return out, lf0_residual
+    def _forward_infer(self, x, lengths):
+        # Predict continuous log-F0 first
+        lf0, lf0_residual = self.lf0_model(x, lengths)
 
-    def inference(self, x, lengths=None):
-        return pad_inference(
-            model=self, x=x, lengths=lengths, reduction_factor=self.reduction_factor
-        )
+        encoder_outs = self._encode(x, lengths, lf0)
 
+        # Decoders for each stream
+        mgc, vuv, bap = self._decode(encoder_outs, lengths)
+
+        return self._make_outputs(mgc, lf0, vuv, bap), lf0_residual
+
+    def _encode(self, x, lengths, lf0):
+        if self.encoder is None:
+            return x
+
+        encoder_outs = self.encoder(x, lengths)
+        # Concat log-F0, rest flags and the outputs of the encoder
+        # This may make the decoder to be aware of the input F0
+        rest_flags = x.narrow(-1, self.in_rest_idx, 1)
+        return torch.cat([encoder_outs, rest_flags, lf0], dim=-1)
+
+    def _decode(self, encoder_outs, lengths):
+        # NOTE: the decoders are independent of each other
+        return _run_in_parallel(
+            self,
+            [
+                lambda: self.mgc_model(encoder_outs, lengths),
+                lambda: self.vuv_model(encoder_outs, lengths),
+                lambda: self.bap_model(encoder_outs, lengths),
+            ],
+            encoder_outs.device,
+        )
 
-class NPSSMultistreamParametricModel(BaseModel):
+    def _make_outputs(self, mgc, lf0, vuv, bap):
+        # make a concatenated stream
+        return _cat_stream_outputs(self, [mgc, lf0, vuv, bap])
+
+    def _inference(self, x, lengths):
+        if self.cuda_graph and x.is_cuda:
+            return self._inference_cuda_graph(x, lengths)
+        return super()._inference(x, lengths)
+
+    def _inference_cuda_graph(self, x, lengths):
+        T = x.shape[1]
+        if self.cuda_graph_bucketing:
+            # Pad the inputs to a bucketed number of frames so that segments of
+            # different lengths share a captured graph
+            pad = _cuda_graph_num_frames(T, self.reduction_factor) - T
+        else:
+            # Pad the inputs in the same way as pad_inference so that the outputs
+            # match those of the eager inference
+            pad = self.reduction_factor - T % self.reduction_factor
+        if pad > 0:
+            x = F.pad(x, (0, 0, 0, pad), mode="replicate")
+        if lengths is not None:
+            lengths = [int(length) + pad for length in lengths]
+
+        params = tuple(p.data_ptr() for p in self.parameters())
+        if params != self._cuda_graph_params:
+            # Parameters have been replaced since the graphs were captured
+            self.clear_cuda_graphs()
+            self._cuda_graph_params = params
+
+        key = (
+            tuple(x.shape),
+            x.dtype,
+            None if lengths is None else tuple(lengths),
+            self.precision,
+        )
+        if key in self._cuda_graphs:
+            self._cuda_graphs.move_to_end(key)
+        else:
+            static_x = x.clone()
+            # Warm-up on a side stream before capturing
+            current_stream = torch.cuda.current_stream(x.device)
+            stream = torch.cuda.Stream(device=x.device)
+            stream.wait_stream(current_stream)
+            with torch.cuda.stream(stream):
+                self._forward_infer(static_x, lengths)
+            current_stream.wait_stream(stream)
+
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph):
+                static_outs = self._forward_infer(static_x, lengths)
+            self._cuda_graphs[key] = (graph, static_x, static_outs)
+            if len(self._cuda_graphs) > self.max_cuda_graphs:
+                self._cuda_graphs.popitem(last=False)
+
+        graph, static_x, static_outs = self._cuda_graphs[key]
+        static_x.copy_(x)
+        graph.replay()
+
+        # Residual F0 prediction: (out, lf0)
+        out = static_outs[0]
+        # Multiple output: (out, out_fine)
+        if isinstance(out, list):
+            out = out[-1]
+        # NOTE: the outputs of the graph are overwritten by the next replay
+        return out[:, :T].clone()
+
+
+class NPSSMultistreamParametricModel(MultistreamBaseModel):
     """NPSS-like cascaded multi-stream model with no mixture density networks.
 
     NPSS: :cite:t:`blaauw2017neural`
@@ -208,9 +738,16 @@ class NPSSMultistreamParametricModel(BaseModel):
             for V/UV prediction.
         vuv_model_lf0_conditioning (bool): If True, use log-F0 features for V/UV prediction.
         vuv_model_mgc_conditioning (bool): If True, use MGC features for V/UV prediction.
-
+        **kwargs: Serving options (``quantize``, ``strict_shape_check``,
+            ``reuse_output_buffer`` and ``precision``). See
+            :py:class:`~nnsvs.acoustic_models.multistream.MultistreamBaseModel`.
     """
 
+    # Number of streams: [MGC, LF0, VUV, BAP]
+    NUM_STREAMS = 4
+    # Stream models quantized by quantize_
+    QUANTIZABLE_MODELS = ("lf0_model", "mgc_model", "vuv_model", "bap_model")
+
     def __init__(
         self,
         in_dim: int,
@@ -234,11 +771,13 @@ class NPSSMultistreamParametricModel(BaseModel):
         vuv_model_bap0_conditioning=False,
         vuv_model_lf0_conditioning=True,
         vuv_model_mgc_conditioning=False,
+        **kwargs,
     ):
-        super().__init__()
+        super().__init__(**kwargs)
         self.in_dim = in_dim
         self.out_dim = out_dim
         self.stream_sizes = stream_sizes
+        self._split_points = _stream_offsets(stream_sizes)[1:-1]
         self.reduction_factor = reduction_factor
         self.vuv_model_bap_conditioning = vuv_model_bap_conditioning
         self.vuv_model_bap0_conditioning = vuv_model_bap0_conditioning
@@ -246,7 +785,7 @@ class NPSSMultistreamParametricModel(BaseModel):
         self.vuv_model_mgc_conditioning = vuv_model_mgc_conditioning
         assert not npss_style_conditioning, "Not supported"
 
-        assert len(stream_sizes) in [4]
+        assert len(stream_sizes) == self.NUM_STREAMS
 
         self.lf0_model = lf0_model
         self.mgc_model = mgc_model
@@ -259,131 +798,96 @@ class NPSSMultistreamParametricModel(BaseModel):
         self.out_lf0_idx = out_lf0_idx
         self.out_lf0_mean = out_lf0_mean
         self.out_lf0_scale = out_lf0_scale
-
-    def _set_lf0_params(self):
-        # Special care for residual F0 prediction models
-        # NOTE: don't overwrite out_lf0_idx and in_lf0_idx
-        if hasattr(self.lf0_model, "out_lf0_mean"):
-            self.lf0_model.in_lf0_min = self.in_lf0_min
-            self.lf0_model.in_lf0_max = self.in_lf0_max
-            self.lf0_model.out_lf0_mean = self.out_lf0_mean
-            self.lf0_model.out_lf0_scale = self.out_lf0_scale
-
-    def prediction_type(self):
-        return PredictionType.DETERMINISTIC
-
-    def is_autoregressive(self):
-        return (
+        # CUDA streams for the MGC and BAP models; created lazily
+        self._cuda_streams = None
+        # NOTE: the model topology is fixed after construction
+        self._is_autoregressive = (
             self.mgc_model.is_autoregressive()
             or self.lf0_model.is_autoregressive()
             or self.vuv_model.is_autoregressive()
             or self.bap_model.is_autoregressive()
         )
 
-    def has_residual_lf0_prediction(self):
-        return True
+    def prediction_type(self):
+        return PredictionType.DETERMINISTIC
 
-    def forward(self, x, lengths=None, y=None):
-        self._set_lf0_params()
-        assert x.shape[-1] == self.in_dim
-        is_inference = y is None
-
-        if is_inference:
-            y_mgc, y_lf0, y_vuv, y_bap = (
-                None,
-                None,
-                None,
-                None,
-            )
-        else:
-            # Teacher-forcing
-            outs = split_streams(y, self.stream_sizes)
-            y_mgc, y_lf0, y_vuv, y_bap = outs
+    def is_autoregressive(self):
+        return self._is_autoregressive
+
+    def _forward_train(self, x, lengths, y):
+        # Teacher-forcing
+        y_mgc, y_lf0, y_vuv, y_bap = torch.tensor_split(y, self._split_points, dim=-1)
 
         # Predict continuous log-F0 first
-        if is_inference:
-            lf0, lf0_residual = self.lf0_model.inference(x, lengths), None
-        else:
-            lf0, lf0_residual = self.lf0_model(x, lengths, y_lf0)
+        lf0, lf0_residual = self.lf0_model(x, lengths, y_lf0)
+
+        # Inputs conditioned on log-F0 that are shared by MGC and BAP models
+        x_lf0 = torch.cat([x, y_lf0], dim=-1)
 
         # Predict spectral parameters
-        if is_inference:
-            mgc_inp = torch.cat([x, lf0], dim=-1)
-            mgc = self.mgc_model.inference(mgc_inp, lengths)
-        else:
-            mgc_inp = torch.cat([x, y_lf0], dim=-1)
-            mgc = self.mgc_model(mgc_inp, lengths, y_mgc)
+        mgc = self.mgc_model(x_lf0, lengths, y_mgc)
 
         # Predict aperiodic parameters
-        if is_inference:
-            bap_inp = torch.cat([x, lf0], dim=-1)
-            bap = self.bap_model.inference(bap_inp, lengths)
-        else:
-            bap_inp = torch.cat([x, y_lf0], dim=-1)
-            bap = self.bap_model(bap_inp, lengths, y_bap)
+        bap = self.bap_model(x_lf0, lengths, y_bap)
 
         # Predict V/UV
-        if is_inference:
-            if self.vuv_model_bap0_conditioning:
-                bap_cond = bap[:, :, 0:1]
-            else:
-                bap_cond = bap
-            # full cond: (x, mgc, lf0, bap)
-            vuv_inp = [x]
-            if self.vuv_model_mgc_conditioning:
-                vuv_inp.append(mgc)
-            if self.vuv_model_bap_conditioning:
-                vuv_inp.append(bap_cond)
-            if self.vuv_model_lf0_conditioning:
-                vuv_inp.append(lf0)
-            vuv_inp = torch.cat(vuv_inp, dim=-1)
-            vuv = self.vuv_model.inference(vuv_inp, lengths)
-        else:
-            if self.vuv_model_bap0_conditioning:
-                y_bap_cond = y_bap[:, :, 0:1]
-            else:
-                y_bap_cond = y_bap
-            vuv_inp = [x]
-            if self.vuv_model_mgc_conditioning:
-                vuv_inp.append(y_mgc)
-            if self.vuv_model_bap_conditioning:
-                vuv_inp.append(y_bap_cond)
-            if self.vuv_model_lf0_conditioning:
-                vuv_inp.append(y_lf0)
-            vuv_inp = torch.cat(vuv_inp, dim=-1)
-            vuv = self.vuv_model(vuv_inp, lengths, y_vuv)
-
-        # make a concatenated stream
-        has_postnet_output = (
-            isinstance(mgc, list) or isinstance(bap, list) or isinstance(vuv, list)
-        )
-        if has_postnet_output:
-            outs = []
-            for idx in range(len(mgc)):
-                mgc_ = mgc[idx] if isinstance(mgc, list) else mgc
-                lf0_ = lf0[idx] if isinstance(lf0, list) else lf0
-                vuv_ = vuv[idx] if isinstance(vuv, list) else vuv
-                bap_ = bap[idx] if isinstance(bap, list) else bap
-                out = torch.cat([mgc_, lf0_, vuv_, bap_], dim=-1)
-                assert out.shape[-1] == self.out_dim
-                outs.append(out)
-        else:
-            outs = torch.cat([mgc, lf0, vuv, bap], dim=-1)
-            assert outs.shape[-1] == self.out_dim
+        vuv_inp = self._vuv_inputs(x, x_lf0, y_mgc, y_lf0, y_bap)
+        vuv = self.vuv_model(vuv_inp, lengths, y_vuv)
 
-        return outs, lf0_residual
+        return self._make_outputs(mgc, lf0, vuv, bap), lf0_residual
 
-    def inference(self, x, lengths=None):
-        return pad_inference(
-            model=self,
-            x=x,
-            lengths=lengths,
-            reduction_factor=self.reduction_factor,
-            mdn=False,
+    def _forward_infer(self, x, lengths):
+        # Predict continuous log-F0 first
+        lf0 = self.lf0_model.inference(x, lengths)
+
+        # Inputs conditioned on log-F0 that are shared by MGC and BAP models
+        x_lf0 = torch.cat([x, lf0], dim=-1)
+
+        # Predict spectral and aperiodic parameters
+        # NOTE: MGC and BAP models are independent of each other given log-F0
+        mgc, bap = _run_in_parallel(
+            self,
+            [
+                lambda: self.mgc_model.inference(x_lf0, lengths),
+                lambda: self.bap_model.inference(x_lf0, lengths),
+            ],
+            x_lf0.device,
         )
 
+        # Predict V/UV
+        vuv_inp = self._vuv_inputs(x, x_lf0, mgc, lf0, bap)
+        vuv = self.vuv_model.inference(vuv_inp, lengths)
+
+        return self._make_outputs(mgc, lf0, vuv, bap), None
+
+    def _vuv_inputs(self, x, x_lf0, mgc, lf0, bap):
+        if self.vuv_model_bap0_conditioning:
+            bap = bap[:, :, 0:1]
+
+        # full cond: (x, mgc, bap, lf0)
+        if (
+            self.vuv_model_lf0_conditioning
+            and not self.vuv_model_mgc_conditioning
+            and not self.vuv_model_bap_conditioning
+        ):
+            # (x, lf0) is shared with the MGC and BAP models
+            return x_lf0
+
+        vuv_inp = [x]
+        if self.vuv_model_mgc_conditioning:
+            vuv_inp.append(mgc)
+        if self.vuv_model_bap_conditioning:
+            vuv_inp.append(bap)
+        if self.vuv_model_lf0_conditioning:
+            vuv_inp.append(lf0)
+        return torch.cat(vuv_inp, dim=-1)
+
+    def _make_outputs(self, mgc, lf0, vuv, bap):
+        # make a concatenated stream
+        return _cat_stream_outputs(self, [mgc, lf0, vuv, bap])
+
 
-class NPSSMDNMultistreamParametricModel(BaseModel):
+class NPSSMDNMultistreamParametricModel(MultistreamBaseModel):
     """NPSS-like cascaded multi-stream parametric model with mixture density networks.
 
     .. note::
@@ -419,8 +923,16 @@ class NPSSMDNMultistreamParametricModel(BaseModel):
             for V/UV prediction.
         vuv_model_lf0_conditioning (bool): If True, use log-F0 features for V/UV prediction.
         vuv_model_mgc_conditioning (bool): If True, use MGC features for V/UV prediction.
+        **kwargs: Serving options (``quantize``, ``strict_shape_check``,
+            ``reuse_output_buffer`` and ``precision``). See
+            :py:class:`~nnsvs.acoustic_models.multistream.MultistreamBaseModel`.
     """
 
+    # Number of streams: [MGC, LF0, VUV, BAP]
+    NUM_STREAMS = 4
+    # Stream models quantized by quantize_
+    QUANTIZABLE_MODELS = ("lf0_model", "mgc_model", "vuv_model", "bap_model")
+
     def __init__(
         self,
         in_dim: int,
@@ -443,18 +955,20 @@ class NPSSMDNMultistreamParametricModel(BaseModel):
         vuv_model_bap0_conditioning=False,
         vuv_model_lf0_conditioning=True,
         vuv_model_mgc_conditioning=False,
+        **kwargs,
     ):
-        super().__init__()
+        super().__init__(**kwargs)
         self.in_dim = in_dim
         self.out_dim = out_dim
         self.stream_sizes = stream_sizes
+        self._split_points = _stream_offsets(stream_sizes)[1:-1]
         self.reduction_factor = reduction_factor
         self.vuv_model_bap_conditioning = vuv_model_bap_conditioning
         self.vuv_model_bap0_conditioning = vuv_model_bap0_conditioning
         self.vuv_model_lf0_conditioning = vuv_model_lf0_conditioning
         self.vuv_model_mgc_conditioning = vuv_model_mgc_conditioning
 
-        assert len(stream_sizes) in [4]
+        assert len(stream_sizes) == self.NUM_STREAMS
 
         self.lf0_model = lf0_model
         self.mgc_model = mgc_model
@@ -467,143 +981,104 @@ class NPSSMDNMultistreamParametricModel(BaseModel):
         self.out_lf0_idx = out_lf0_idx
         self.out_lf0_mean = out_lf0_mean
         self.out_lf0_scale = out_lf0_scale
-
-    def _set_lf0_params(self):
-        # Special care for residual F0 prediction models
-        # NOTE: don't overwrite out_lf0_idx and in_lf0_idx
-        if hasattr(self.lf0_model, "out_lf0_mean"):
-            self.lf0_model.in_lf0_min = self.in_lf0_min
-            self.lf0_model.in_lf0_max = self.in_lf0_max
-            self.lf0_model.out_lf0_mean = self.out_lf0_mean
-            self.lf0_model.out_lf0_scale = self.out_lf0_scale
-
-    def prediction_type(self):
-        return PredictionType.MULTISTREAM_HYBRID
-
-    def is_autoregressive(self):
-        return (
+        # CUDA streams for the MGC and BAP models; created lazily
+        self._cuda_streams = None
+        # Streams whose inference returns (mu, sigma); fixed by the stream models
+        self._lf0_is_mdn = lf0_model.prediction_type() == PredictionType.PROBABILISTIC
+        self._mgc_is_mdn = mgc_model.prediction_type() == PredictionType.PROBABILISTIC
+        self._bap_is_mdn = bap_model.prediction_type() == PredictionType.PROBABILISTIC
+        # NOTE: the model topology is fixed after construction
+        self._is_autoregressive = (
             self.mgc_model.is_autoregressive()
             or self.lf0_model.is_autoregressive()
             or self.vuv_model.is_autoregressive()
             or self.bap_model.is_autoregressive()
         )
 
-    def has_residual_lf0_prediction(self):
-        return True
+    def prediction_type(self):
+        return PredictionType.MULTISTREAM_HYBRID
 
-    def forward(self, x, lengths=None, y=None):
-        self._set_lf0_params()
-        assert x.shape[-1] == self.in_dim
-        is_inference = y is None
-
-        if is_inference:
-            y_mgc, y_lf0, y_vuv, y_bap = (
-                None,
-                None,
-                None,
-                None,
-            )
-        else:
-            # Teacher-forcing
-            outs = split_streams(y, self.stream_sizes)
-            y_mgc, y_lf0, y_vuv, y_bap = outs
+    def is_autoregressive(self):
+        return self._is_autoregressive
+
+    def _forward_train(self, x, lengths, y):
+        # Teacher-forcing
+        y_mgc, y_lf0, y_vuv, y_bap = torch.tensor_split(y, self._split_points, dim=-1)
 
         # Predict continuous log-F0 first
-        if is_inference:
-            lf0, lf0_residual = self.lf0_model.inference(x, lengths), None
-            if self.lf0_model.prediction_type() == PredictionType.PROBABILISTIC:
-                lf0_cond = lf0[0]
-            else:
-                lf0_cond = lf0
-        else:
-            lf0, lf0_residual = self.lf0_model(x, lengths, y_lf0)
+        lf0, lf0_residual = self.lf0_model(x, lengths, y_lf0)
+
+        # Inputs conditioned on log-F0 that are shared by MGC and BAP models
+        x_lf0 = torch.cat([x, y_lf0], dim=-1)
+
         # Predict spectral parameters
-        if is_inference:
-            mgc_inp = torch.cat([x, lf0_cond], dim=-1)
-            mgc = self.mgc_model.inference(mgc_inp, lengths)
-        else:
-            mgc_inp = torch.cat([x, y_lf0], dim=-1)
-            mgc = self.mgc_model(mgc_inp, lengths, y_mgc)
+        mgc = self.mgc_model(x_lf0, lengths, y_mgc)
 
         # Predict aperiodic parameters
-        if is_inference:
-            bap_inp = torch.cat([x, lf0_cond], dim=-1)
-            bap = self.bap_model.inference(bap_inp, lengths)
-        else:
-            bap_inp = torch.cat([x, y_lf0], dim=-1)
-            bap = self.bap_model(bap_inp, lengths, y_bap)
+        bap = self.bap_model(x_lf0, lengths, y_bap)
 
         # Predict V/UV
-        if is_inference:
-            if self.bap_model.prediction_type() == PredictionType.PROBABILISTIC:
-                bap_cond = bap[0]
-            else:
-                bap_cond = bap
-            if self.mgc_model.prediction_type() == PredictionType.PROBABILISTIC:
-                mgc_cond = mgc[0]
-            else:
-                mgc_cond = mgc
-
-            if self.vuv_model_bap0_conditioning:
-                bap_cond = bap_cond[:, :, 0:1]
-
-            # full cond: (x, mgc, lf0, bap)
-            vuv_inp = [x]
-            if self.vuv_model_mgc_conditioning:
-                vuv_inp.append(mgc_cond)
-            if self.vuv_model_lf0_conditioning:
-                vuv_inp.append(lf0_cond)
-            if self.vuv_model_bap_conditioning:
-                vuv_inp.append(bap_cond)
-            vuv_inp = torch.cat(vuv_inp, dim=-1)
-            vuv = self.vuv_model.inference(vuv_inp, lengths)
-        else:
-            if self.vuv_model_bap0_conditioning:
-                y_bap_cond = y_bap[:, :, 0:1]
-            else:
-                y_bap_cond = y_bap
-
-            vuv_inp = [x]
-            if self.vuv_model_mgc_conditioning:
-                vuv_inp.append(y_mgc)
-            if self.vuv_model_lf0_conditioning:
-                vuv_inp.append(y_lf0)
-            if self.vuv_model_bap_conditioning:
-                vuv_inp.append(y_bap_cond)
-            vuv_inp = torch.cat(vuv_inp, dim=-1)
-            vuv = self.vuv_model(vuv_inp, lengths, y_vuv)
-
-        if is_inference:
-            if self.lf0_model.prediction_type() == PredictionType.PROBABILISTIC:
-                lf0_ = lf0[0]
-            else:
-                lf0_ = lf0
-            if self.bap_model.prediction_type() == PredictionType.PROBABILISTIC:
-                bap_ = bap[0]
-            else:
-                bap_ = bap
-            if self.mgc_model.prediction_type() == PredictionType.PROBABILISTIC:
-                mgc_ = mgc[0]
-            else:
-                mgc_ = mgc
-            out = torch.cat([mgc_, lf0_, vuv, bap_], dim=-1)
-            assert out.shape[-1] == self.out_dim
-            # TODO: better design
-            return out, out
-        else:
-            return (mgc, lf0, vuv, bap), lf0_residual
+        vuv_inp = self._vuv_inputs(x, x_lf0, y_mgc, y_lf0, y_bap)
+        vuv = self.vuv_model(vuv_inp, lengths, y_vuv)
 
-    def inference(self, x, lengths=None):
-        return pad_inference(
-            model=self,
-            x=x,
-            lengths=lengths,
-            reduction_factor=self.reduction_factor,
-            mdn=True,
+        return (mgc, lf0, vuv, bap), lf0_residual
+
+    def _forward_infer(self, x, lengths):
+        # Predict continuous log-F0 first
+        lf0 = self.lf0_model.inference(x, lengths)
+        if self._lf0_is_mdn:
+            lf0 = lf0[0]
+
+        # Inputs conditioned on log-F0 that are shared by MGC and BAP models
+        x_lf0 = torch.cat([x, lf0], dim=-1)
+
+        # Predict spectral and aperiodic parameters
+        # NOTE: MGC and BAP models are independent of each other given log-F0
+        mgc, bap = _run_in_parallel(
+            self,
+            [
+                lambda: self.mgc_model.inference(x_lf0, lengths),
+                lambda: self.bap_model.inference(x_lf0, lengths),
+            ],
+            x_lf0.device,
         )
+        if self._mgc_is_mdn:
+            mgc = mgc[0]
+        if self._bap_is_mdn:
+            bap = bap[0]
+
+        # Predict V/UV
+        vuv_inp = self._vuv_inputs(x, x_lf0, mgc, lf0, bap)
+        vuv = self.vuv_model.inference(vuv_inp, lengths)
+
+        out = _cat_streams([mgc, lf0, vuv, bap], self)
+        if self.strict_shape_check:
+            assert out.shape[-1] == self.out_dim
+        # TODO: better design
+        return out, out
 
+    def _vuv_inputs(self, x, x_lf0, mgc, lf0, bap):
+        if self.vuv_model_bap0_conditioning:
+            bap = bap[:, :, 0:1]
+
+        # full cond: (x, mgc, lf0, bap)
+        if self.vuv_model_lf0_conditioning and not self.vuv_model_mgc_conditioning:
+            # (x, lf0) is shared with the MGC and BAP models
+            if self.vuv_model_bap_conditioning:
+                return torch.cat([x_lf0, bap], dim=-1)
+            return x_lf0
 
-class MultistreamSeparateF0MelModel(BaseModel):
+        vuv_inp = [x]
+        if self.vuv_model_mgc_conditioning:
+            vuv_inp.append(mgc)
+        if self.vuv_model_lf0_conditioning:
+            vuv_inp.append(lf0)
+        if self.vuv_model_bap_conditioning:
+            vuv_inp.append(bap)
+        return torch.cat(vuv_inp, dim=-1)
+
+
+class MultistreamSeparateF0MelModel(MultistreamBaseModel):
     """Multi-stream model with a separate F0 prediction model (mel-version)
 
     Conditional dependency:
@@ -625,8 +1100,16 @@ class MultistreamSeparateF0MelModel(BaseModel):
         out_lf0_idx (int): index of lf0 in output features. Typically 180.
         out_lf0_mean (float): mean of lf0 in the training data of output features
         out_lf0_scale (float): scale of lf0 in the training data of output features
+        **kwargs: Serving options (``quantize``, ``strict_shape_check``,
+            ``reuse_output_buffer`` and ``precision``). See
+            :py:class:`~nnsvs.acoustic_models.multistream.MultistreamBaseModel`.
     """
 
+    # Number of streams: [MEL, LF0, VUV]
+    NUM_STREAMS = 3
+    # Stream models quantized by quantize_
+    QUANTIZABLE_MODELS = ("lf0_model", "mel_model", "vuv_model")
+
     def __init__(
         self,
         in_dim: int,
@@ -645,14 +1128,16 @@ class MultistreamSeparateF0MelModel(BaseModel):
         out_lf0_idx=180,
         out_lf0_mean=5.953093881972361,
         out_lf0_scale=0.23435173188961034,
+        **kwargs,
     ):
-        super().__init__()
+        super().__init__(**kwargs)
         self.in_dim = in_dim
         self.out_dim = out_dim
         self.stream_sizes = stream_sizes
+        self._split_points = _stream_offsets(stream_sizes)[1:-1]
         self.reduction_factor = reduction_factor
 
-        assert len(stream_sizes) == 3
+        assert len(stream_sizes) == self.NUM_STREAMS
 
         self.encoder = encoder
         if self.encoder is not None:
@@ -667,95 +1152,71 @@ class MultistreamSeparateF0MelModel(BaseModel):
         self.out_lf0_idx = out_lf0_idx
         self.out_lf0_mean = out_lf0_mean
         self.out_lf0_scale = out_lf0_scale
-
-    def _set_lf0_params(self):
-        # Special care for residual F0 prediction models
-        # NOTE: don't overwrite out_lf0_idx and in_lf0_idx
-        if hasattr(self.lf0_model, "out_lf0_mean"):
-            self.lf0_model.in_lf0_min = self.in_lf0_min
-            self.lf0_model.in_lf0_max = self.in_lf0_max
-            self.lf0_model.out_lf0_mean = self.out_lf0_mean
-            self.lf0_model.out_lf0_scale = self.out_lf0_scale
-
-    def is_autoregressive(self):
-        return (
+        # CUDA streams for the decoders; created lazily
+        self._cuda_streams = None
+        # NOTE: the model topology is fixed after construction
+        self._is_autoregressive = (
             self.mel_model.is_autoregressive()
             or self.lf0_model.is_autoregressive()
             or self.vuv_model.is_autoregressive()
         )
 
-    def has_residual_lf0_prediction(self):
-        return True
-
-    def forward(self, x, lengths=None, y=None):
-        self._set_lf0_params()
-        assert x.shape[-1] == self.in_dim
+    def is_autoregressive(self):
+        return self._is_autoregressive
 
-        if y is not None:
-            # Teacher-forcing
-            outs = split_streams(y, self.stream_sizes)
-            y_mel, y_lf0, y_vuv = outs
-        else:
-            # Inference
-            y_mel, y_lf0, y_vuv = (
-                None,
-                None,
-                None,
-            )
+    def _forward_train(self, x, lengths, y):
+        # Teacher-forcing
+        y_mel, y_lf0, y_vuv = torch.tensor_split(y, self._split_points, dim=-1)
 
         # Predict continuous log-F0 first
         lf0, lf0_residual = self.lf0_model(x, lengths, y_lf0)
 
-        if self.encoder is not None:
-            encoder_outs = self.encoder(x, lengths)
-            # Concat log-F0, rest flags and the outputs of the encoder
-            # This may make the decoder to be aware of the input F0
-            rest_flags = x[:, :, self.in_rest_idx].unsqueeze(-1)
-            if y is not None:
-                encoder_outs = torch.cat([encoder_outs, rest_flags, y_lf0], dim=-1)
-            else:
-                encoder_outs = torch.cat([encoder_outs, rest_flags, lf0], dim=-1)
-        else:
-            encoder_outs = x
+        encoder_outs = self._encode(x, lengths, y_lf0)
 
         # Decoders for each stream
         mel = self.mel_model(encoder_outs, lengths, y_mel)
         vuv = self.vuv_model(encoder_outs, lengths, y_vuv)
 
-        # make a concatenated stream
-        has_postnet_output = (
-            isinstance(mel, list) or isinstance(lf0, list) or isinstance(vuv, list)
-        )
-        if has_postnet_output:
-            outs = []
-            for idx in range(len(mel)):
-                mel_ = mel[idx] if isinstance(mel, list) else mel
-                lf0_ = lf0[idx] if isinstance(lf0, list) else lf0
-                vuv_ = vuv[idx] if isinstance(vuv, list) else vuv
-                out = torch.cat([mel_, lf0_, vuv_], dim=-1)
-                assert out.shape[-1] == self.out_dim
-                outs.append(out)
-            return outs, lf0_residual
-        else:
-            out = torch.cat(
-                [
-                    mel,
-                    lf0,
-                    vuv,
-                ],
-                dim=-1,
-            )
-            assert out.shape[-1] == self.out_dim
+        return self._make_outputs(mel, lf0, vuv), lf0_residual
 
-        return out, lf0_residual
+    def _forward_infer(self, x, lengths):
+        # Predict continuous log-F0 first
+        lf0, lf0_residual = self.lf0_model(x, lengths)
 
-    def inference(self, x, lengths=None):
-        return pad_inference(
-            model=self, x=x, lengths=lengths, reduction_factor=self.reduction_factor
+        encoder_outs = self._encode(x, lengths, lf0)
+
+        # Decoders for each stream
+        mel, vuv = self._decode(encoder_outs, lengths)
+
+        return self._make_outputs(mel, lf0, vuv), lf0_residual
+
+    def _encode(self, x, lengths, lf0):
+        if self.encoder is None:
+            return x
+
+        encoder_outs = self.encoder(x, lengths)
+        # Concat log-F0, rest flags and the outputs of the encoder
+        # This may make the decoder to be aware of the input F0
+        rest_flags = x.narrow(-1, self.in_rest_idx, 1)
+        return torch.cat([encoder_outs, rest_flags, lf0], dim=-1)
+
+    def _decode(self, encoder_outs, lengths):
+        # NOTE: the decoders are independent of each other
+        return _run_in_parallel(
+            self,
+            [
+                lambda: self.mel_model(encoder_outs, lengths),
+                lambda: self.vuv_model(encoder_outs, lengths),
+            ],
+            encoder_outs.device,
         )
 
+    def _make_outputs(self, mel, lf0, vuv):
+        # make a concatenated stream
+        return _cat_stream_outputs(self, [mel, lf0, vuv])
+
 
-class MDNMultistreamSeparateF0MelModel(BaseModel):
+class MDNMultistreamSeparateF0MelModel(MultistreamBaseModel):
     """Multi-stream model with a separate F0 model (mel-version) and mDN
 
     V/UV prediction is performed given a mel-spectrogram.
@@ -787,8 +1248,16 @@ class MDNMultistreamSeparateF0MelModel(BaseModel):
         out_lf0_scale (float): scale of lf0 in the training data of output features
         vuv_model_lf0_conditioning (bool): If True, use log-F0 features for V/UV prediction.
         vuv_model_mel_conditioning (bool): If True, use mel features for V/UV prediction.
+        **kwargs: Serving options (``quantize``, ``strict_shape_check``,
+            ``reuse_output_buffer`` and ``precision``). See
+            :py:class:`~nnsvs.acoustic_models.multistream.MultistreamBaseModel`.
     """
 
+    # Number of streams: [MEL, LF0, VUV]
+    NUM_STREAMS = 3
+    # Stream models quantized by quantize_
+    QUANTIZABLE_MODELS = ("lf0_model", "mel_model", "vuv_model")
+
     def __init__(
         self,
         in_dim: int,
@@ -808,16 +1277,18 @@ class MDNMultistreamSeparateF0MelModel(BaseModel):
         out_lf0_scale=0.23435173188961034,
         vuv_model_lf0_conditioning=True,
         vuv_model_mel_conditioning=True,
+        **kwargs,
     ):
-        super().__init__()
+        super().__init__(**kwargs)
         self.in_dim = in_dim
         self.out_dim = out_dim
         self.stream_sizes = stream_sizes
+        self._split_points = _stream_offsets(stream_sizes)[1:-1]
         self.reduction_factor = reduction_factor
         self.vuv_model_lf0_conditioning = vuv_model_lf0_conditioning
         self.vuv_model_mel_conditioning = vuv_model_mel_conditioning
 
-        assert len(stream_sizes) in [3]
+        assert len(stream_sizes) == self.NUM_STREAMS
 
         self.mel_model = mel_model
         self.lf0_model = lf0_model
@@ -829,109 +1300,70 @@ class MDNMultistreamSeparateF0MelModel(BaseModel):
         self.out_lf0_idx = out_lf0_idx
         self.out_lf0_mean = out_lf0_mean
         self.out_lf0_scale = out_lf0_scale
-
-    def _set_lf0_params(self):
-        # Special care for residual F0 prediction models
-        # NOTE: don't overwrite out_lf0_idx and in_lf0_idx
-        if hasattr(self.lf0_model, "out_lf0_mean"):
-            self.lf0_model.in_lf0_min = self.in_lf0_min
-            self.lf0_model.in_lf0_max = self.in_lf0_max
-            self.lf0_model.out_lf0_mean = self.out_lf0_mean
-            self.lf0_model.out_lf0_scale = self.out_lf0_scale
+        # Streams whose inference returns (mu, sigma); fixed by the stream models
+        self._lf0_is_mdn = lf0_model.prediction_type() == PredictionType.PROBABILISTIC
+        self._mel_is_mdn = mel_model.prediction_type() == PredictionType.PROBABILISTIC
+        # NOTE: the model topology is fixed after construction
+        self._is_autoregressive = (
+            self.mel_model.is_autoregressive()
+            or self.lf0_model.is_autoregressive()
+            or self.vuv_model.is_autoregressive()
+        )
 
     def prediction_type(self):
         return PredictionType.MULTISTREAM_HYBRID
 
     def is_autoregressive(self):
-        return (
-            self.mel_model.is_autoregressive()
-            or self.lf0_model.is_autoregressive()
-            or self.vuv_model.is_autoregressive()
-        )
+        return self._is_autoregressive
 
-    def has_residual_lf0_prediction(self):
-        return True
+    def _forward_train(self, x, lengths, y):
+        # Teacher-forcing
+        y_mel, y_lf0, y_vuv = torch.tensor_split(y, self._split_points, dim=-1)
 
-    def forward(self, x, lengths=None, y=None):
-        self._set_lf0_params()
-        assert x.shape[-1] == self.in_dim
-        is_inference = y is None
-
-        if y is not None:
-            # Teacher-forcing
-            outs = split_streams(y, self.stream_sizes)
-            y_mel, y_lf0, y_vuv = outs
-        else:
-            # Inference
-            y_mel, y_lf0, y_vuv = (
-                None,
-                None,
-                None,
-            )
+        # Predict continuous log-F0 first
+        lf0, lf0_residual = self.lf0_model(x, lengths, y_lf0)
+
+        # Predict mel
+        x_lf0 = torch.cat([x, y_lf0], dim=-1)
+        mel = self.mel_model(x_lf0, lengths, y_mel)
 
+        # Predict V/UV
+        vuv_inp = self._vuv_inputs(x, x_lf0, y_lf0, y_mel)
+        vuv = self.vuv_model(vuv_inp, lengths, y_vuv)
+
+        return (mel, lf0, vuv), lf0_residual
+
+    def _forward_infer(self, x, lengths):
         # Predict continuous log-F0 first
-        if is_inference:
-            lf0, lf0_residual = self.lf0_model.inference(x, lengths), None
-            if self.lf0_model.prediction_type() == PredictionType.PROBABILISTIC:
-                lf0_cond = lf0[0]
-            else:
-                lf0_cond = lf0
-        else:
-            lf0, lf0_residual = self.lf0_model(x, lengths, y_lf0)
+        lf0 = self.lf0_model.inference(x, lengths)
+        if self._lf0_is_mdn:
+            lf0 = lf0[0]
 
         # Predict mel
-        if is_inference:
-            mel_inp = torch.cat([x, lf0_cond], dim=-1)
-            mel = self.mel_model.inference(mel_inp, lengths)
-        else:
-            mel_inp = torch.cat([x, y_lf0], dim=-1)
-            mel = self.mel_model(mel_inp, lengths, y_mel)
+        x_lf0 = torch.cat([x, lf0], dim=-1)
+        mel = self.mel_model.inference(x_lf0, lengths)
+        if self._mel_is_mdn:
+            mel = mel[0]
 
         # Predict V/UV
-        if is_inference:
-            if self.mel_model.prediction_type() == PredictionType.PROBABILISTIC:
-                mel_cond = mel[0]
-            else:
-                mel_cond = mel
-
-            # full cond: (x, lf0, mel)
-            vuv_inp = [x]
-            if self.vuv_model_lf0_conditioning:
-                vuv_inp.append(lf0_cond)
-            if self.vuv_model_mel_conditioning:
-                vuv_inp.append(mel_cond)
-            vuv_inp = torch.cat(vuv_inp, dim=-1)
-            vuv = self.vuv_model.inference(vuv_inp, lengths)
-        else:
-            vuv_inp = [x]
-            if self.vuv_model_lf0_conditioning:
-                vuv_inp.append(y_lf0)
-            if self.vuv_model_mel_conditioning:
-                vuv_inp.append(y_mel)
-            vuv_inp = torch.cat(vuv_inp, dim=-1)
-            vuv = self.vuv_model(vuv_inp, lengths, y_vuv)
-
-        if is_inference:
-            if self.lf0_model.prediction_type() == PredictionType.PROBABILISTIC:
-                lf0_ = lf0[0]
-            else:
-                lf0_ = lf0
-            if self.mel_model.prediction_type() == PredictionType.PROBABILISTIC:
-                mel_ = mel[0]
-            else:
-                mel_ = mel
-            out = torch.cat([mel_, lf0_, vuv], dim=-1)
+        vuv_inp = self._vuv_inputs(x, x_lf0, lf0, mel)
+        vuv = self.vuv_model.inference(vuv_inp, lengths)
+
+        out = _cat_streams([mel, lf0, vuv], self)
+        if self.strict_shape_check:
             assert out.shape[-1] == self.out_dim
-            # TODO: better design
-            return out, out
-        else:
-            return (mel, lf0, vuv), lf0_residual
+        # TODO: better design
+        return out, out
 
-    def inference(self, x, lengths=None):
-        return pad_inference(
-            model=self,
-            x=x,
-            lengths=lengths,
-            reduction_factor=self.reduction_factor,
-            mdn=True,
-        )
+    def _vuv_inputs(self, x, x_lf0, lf0, mel):
+        # full cond: (x, lf0, mel)
+        if self.vuv_model_lf0_conditioning:
+            # (x, lf0) is shared with the mel model
+            if self.vuv_model_mel_conditioning:
+                return torch.cat([x_lf0, mel], dim=-1)
+            return x_lf0
+
+        vuv_inp = [x]
+        if self.vuv_model_mel_conditioning:
+            vuv_inp.append(mel)
+        return torch.cat(vuv_inp, dim=-1)
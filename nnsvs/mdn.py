@@ -29,6 +29,10 @@ class MDNLayer(nn.Module):
         dim_wise (bool): whether to model data for each dimension separately
     """
 
+    # NOTE: mixture parameters are sensitive to the precision, so they are kept
+    # in floating point when the rest of the model is quantized
+    _disable_quant = True
+
     def __init__(self, in_dim, out_dim, num_gaussians=30, dim_wise=False):
         super(MDNLayer, self).__init__()
         self.in_dim = in_dim
@@ -58,7 +62,8 @@ class MDNLayer(nn.Module):
             torch.Tensor: Tensor of shape (B, T, G, D_out)
                 mean of each Gaussians
         """
-        B = len(minibatch)
+        # NOTE: don't use len() so that the batch size is traced as a dynamic axis
+        B = minibatch.shape[0]
         if self.dim_wise:
             # (B, T, G, D_out)
             log_pi = self.log_pi(minibatch).view(
@@ -157,10 +162,10 @@ def mdn_loss(
 # from r9y9/wavenet_vocoder/wavenet_vocoder/mixture.py
 def to_one_hot(tensor, n, fill_with=1.0):
     # we perform one hot encore with respect to the last axis
-    one_hot = torch.FloatTensor(tensor.size() + (n,)).zero_()
-    if tensor.is_cuda:
-        one_hot = one_hot.cuda()
-    one_hot.scatter_(len(tensor.size()), tensor.unsqueeze(-1), fill_with)
+    # NOTE: F.one_hot keeps the shape dynamic when the model is traced (e.g., ONNX)
+    one_hot = F.one_hot(tensor, n).float()
+    if fill_with != 1.0:
+        one_hot = one_hot * fill_with
     return one_hot
 
 
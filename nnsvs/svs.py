@@ -207,6 +207,14 @@ class SPSVS(BaseSVS):
 
         self.acoustic_model.eval()
 
+        # (Optional) int8 dynamic quantization for CPU inference
+        if getattr(self.acoustic_model, "quantize", False):
+            if torch.device(device).type == "cpu":
+                self.logger.info("Quantizing the acoustic model.")
+                self.acoustic_model.quantize_()
+            else:
+                self.logger.warning("Quantization is only supported on CPU.")
+
         # Post-filter
         if (model_dir / "postfilter_model.yaml").exists():
             self.postfilter_config = OmegaConf.load(model_dir / "postfilter_model.yaml")
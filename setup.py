@@ -25,7 +25,7 @@ setup(
         "numpy",
         "scipy",
         "cython",
-        "torch >= 1.6.0",
+        "torch >= 1.10.0",
         "torchaudio",
         "hydra-core >= 1.1.0, < 1.2.0",
         "hydra_colorlog >= 1.1.0",
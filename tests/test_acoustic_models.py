@@ -1,4 +1,5 @@
 import pytest
+import torch
 from nnsvs.acoustic_models import (
     BiLSTMMDNNonAttentiveDecoder,
     BiLSTMNonAttentiveDecoder,
@@ -19,6 +20,7 @@ from nnsvs.acoustic_models import (
     ResSkipF0FFConvLSTM,
 )
 from nnsvs.base import PredictionType
+from nnsvs.mdn import MDNLayer
 from nnsvs.model import FFN, MDN, FFConvLSTM, LSTMEncoder, TransformerEncoder
 
 from .util import _test_model_impl
@@ -888,3 +890,306 @@ def test_nonar_multistream_parametric_model_no_encoder():
     assert model.prediction_type() == PredictionType.DETERMINISTIC
     assert not model.is_autoregressive()
     _test_model_impl(model, params["in_dim"], params["out_dim"])
+
+
+def _make_lf0_model(**kwargs):
+    return ResF0Conv1dResnet(
+        in_dim=300,
+        hidden_dim=5,
+        out_dim=1,
+        num_layers=1,
+        in_lf0_idx=-1,
+        out_lf0_idx=0,
+        **kwargs,
+    )
+
+
+def _make_multistream_parametric_model(**kwargs):
+    params = {
+        "in_dim": 300,
+        "out_dim": 67,
+        "stream_sizes": [60, 1, 1, 5],
+        "reduction_factor": 1,
+        "encoder": None,
+        "lf0_model": _make_lf0_model(),
+        "mgc_model": FFN(in_dim=300, hidden_dim=5, out_dim=60),
+        "vuv_model": FFN(in_dim=300, hidden_dim=5, out_dim=1),
+        "bap_model": FFN(in_dim=300, hidden_dim=5, out_dim=5),
+    }
+    return MultistreamSeparateF0ParametricModel(**{**params, **kwargs})
+
+
+def _make_npss_multistream_parametric_model(mdn=False, **kwargs):
+    params = {
+        "in_dim": 300,
+        "out_dim": 67,
+        "stream_sizes": [60, 1, 1, 5],
+        "reduction_factor": 1,
+        "lf0_model": _make_lf0_model(),
+        "mgc_model": FFN(in_dim=301, hidden_dim=5, out_dim=60),
+        "vuv_model": FFN(in_dim=306, hidden_dim=5, out_dim=1),
+        "bap_model": FFN(in_dim=301, hidden_dim=5, out_dim=5),
+    }
+    if mdn:
+        params["mgc_model"] = MDN(
+            in_dim=301, hidden_dim=5, out_dim=60, dim_wise=True, num_gaussians=2
+        )
+        params["bap_model"] = MDN(
+            in_dim=301, hidden_dim=5, out_dim=5, dim_wise=True, num_gaussians=2
+        )
+        return NPSSMDNMultistreamParametricModel(**{**params, **kwargs})
+    return NPSSMultistreamParametricModel(**{**params, **kwargs})
+
+
+def test_multistream_reuse_output_buffer():
+    model = _make_npss_multistream_parametric_model(reuse_output_buffer=True)
+    model.eval()
+    x = torch.rand(2, 10, 300)
+    y1 = model.inference(x, [10, 10]).clone()
+    y2 = model.inference(x, [10, 10])
+    assert torch.equal(y1, y2)
+    # The second call writes into the same storage
+    y3 = model.inference(x, [10, 10])
+    assert y2.data_ptr() == y3.data_ptr()
+
+    # No buffer reuse when autograd is enabled
+    y4 = model(x, [10, 10])[0]
+    assert y4.data_ptr() != y3.data_ptr()
+
+    # No buffer reuse in train mode (e.g., validation without autograd)
+    model.train()
+    with torch.no_grad():
+        y5 = model(x, [10, 10])[0]
+    assert y5.data_ptr() != y3.data_ptr()
+
+
+@pytest.mark.parametrize("precision", ["fp16", "bf16"])
+def test_multistream_half_precision_inference(precision):
+    model = _make_npss_multistream_parametric_model()
+    model.eval()
+    x = torch.rand(2, 10, 300)
+    y = model.inference(x, [10, 10])
+
+    model.precision = precision
+    y_half = model.inference(x, [10, 10])
+    # Outputs are cast back to the input dtype
+    assert y_half.dtype == x.dtype
+    assert y_half.shape == y.shape
+    assert torch.allclose(y, y_half, atol=0.1)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA is not available")
+def test_multistream_cuda_graph():
+    model = _make_multistream_parametric_model(cuda_graph=True, max_cuda_graphs=2)
+    model = model.cuda().eval()
+
+    # Outputs match those of the eager inference at any length
+    x = torch.rand(1, 128, 300, device="cuda")
+    for T in [100, 128]:
+        y = model.inference(x[:, :T], [T])
+        model.cuda_graph = False
+        y_ref = model.inference(x[:, :T], [T])
+        model.cuda_graph = True
+        assert torch.allclose(y, y_ref, atol=1e-5)
+    assert len(model._cuda_graphs) == 2
+
+    # Inputs of lengths in the same bucket share a graph
+    model.cuda_graph_bucketing = True
+    model.clear_cuda_graphs()
+    for T in [100, 105, 110]:
+        assert model.inference(x[:, :T], [T]).shape == (1, T, 67)
+    assert len(model._cuda_graphs) == 1
+
+    # The least recently used graphs are released
+    for T in [200, 300, 400]:
+        model.inference(torch.rand(1, T, 300, device="cuda"), [T])
+    assert len(model._cuda_graphs) == 2
+
+    # forward is not dispatched to the graphs
+    with torch.no_grad():
+        model(x, [128])
+
+    model.clear_cuda_graphs()
+    assert len(model._cuda_graphs) == 0
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA is not available")
+@pytest.mark.parametrize("precision", ["fp16", "bf16"])
+def test_multistream_cuda_graph_half_precision(precision):
+    model = _make_multistream_parametric_model(cuda_graph=True, precision=precision)
+    model = model.cuda().eval()
+
+    x = torch.rand(1, 128, 300, device="cuda")
+    model.cuda_graph = False
+    y_ref = model.inference(x, [128])
+    model.cuda_graph = True
+    # Replays after the capturing call must not read freed weight casts
+    for _ in range(3):
+        y = model.inference(x, [128])
+        assert y.dtype == x.dtype
+        assert torch.allclose(y, y_ref, atol=1e-2)
+    assert len(model._cuda_graphs) == 1
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA is not available")
+def test_multistream_cuda_streams_inference_only():
+    model = _make_multistream_parametric_model().cuda()
+    x = torch.rand(2, 10, 300, device="cuda")
+    y = torch.rand(2, 10, 67, device="cuda")
+
+    # Training runs the decoders on the current stream
+    outs, _ = model(x, [10, 10], y)
+    outs.sum().backward()
+    assert model._cuda_streams is None
+
+    model.eval()
+    model.inference(x, [10, 10])
+    assert model._cuda_streams is not None
+
+
+def test_multistream_pickle(tmp_path):
+    model = _make_multistream_parametric_model()
+    model.eval()
+    x = torch.rand(1, 10, 300)
+    y = model.inference(x, [10])
+    torch.save(model, tmp_path / "model.pt")
+    model = torch.load(tmp_path / "model.pt", weights_only=False)
+    assert torch.allclose(model.inference(x, [10]), y)
+
+
+def test_multistream_lf0_params():
+    model = _make_multistream_parametric_model(in_lf0_min=5.0, out_lf0_mean=6.0)
+    assert model.lf0_model.in_lf0_min == 5.0
+    assert model.lf0_model.out_lf0_mean == 6.0
+
+    # Updates after construction are propagated to the lf0 model
+    model.in_lf0_min = 4.0
+    model.out_lf0_scale = 0.5
+    assert model.in_lf0_min == 4.0
+    assert model.lf0_model.in_lf0_min == 4.0
+    assert model.lf0_model.out_lf0_scale == 0.5
+
+    # A residual F0 model assigned after construction gets the current values
+    model.lf0_model = _make_lf0_model()
+    assert model.lf0_model.in_lf0_min == 4.0
+    assert model.lf0_model.out_lf0_mean == 6.0
+
+    # Unset params are reported as missing attributes
+    del model.__dict__["_in_lf0_max"]
+    assert not hasattr(model, "in_lf0_max")
+
+
+def test_multistream_parametric_model_quantize():
+    model = _make_multistream_parametric_model(quantize=True)
+    model.bap_model._disable_quant = True
+
+    def is_quantized(module):
+        return any(
+            isinstance(m, torch.ao.nn.quantized.dynamic.Linear)
+            for m in module.modules()
+        )
+
+    # Quantization must be explicitly requested in eval mode
+    with pytest.raises(RuntimeError):
+        model.quantize_()
+    model.eval()
+    x = torch.rand(2, 10, 300)
+    model.inference(x, [10, 10])
+    assert not is_quantized(model.mgc_model)
+
+    model.quantize_()
+    y = model.inference(x, [10, 10])
+    assert y.shape == (2, 10, 67)
+    assert is_quantized(model.mgc_model)
+    assert not is_quantized(model.bap_model)
+
+
+def test_npss_mdn_multistream_parametric_model_quantize():
+    model = _make_npss_multistream_parametric_model(mdn=True)
+    model.eval()
+    model.quantize_()
+    x = torch.rand(2, 10, 300)
+    model.inference(x, [10, 10])
+
+    for stream_model in [model.mgc_model, model.bap_model]:
+        # The FFN layers are quantized but the MDN layers are left as is
+        assert any(
+            isinstance(m, torch.ao.nn.quantized.dynamic.Linear)
+            for m in stream_model.modules()
+        )
+        mdn_layers = [m for m in stream_model.modules() if isinstance(m, MDNLayer)]
+        assert len(mdn_layers) == 1
+        for m in mdn_layers[0].modules():
+            assert not isinstance(m, torch.ao.nn.quantized.dynamic.Linear)
+
+
+def _check_exported_onnx(model, path, in_dim=300):
+    ort = pytest.importorskip("onnxruntime")
+    from nnsvs.acoustic_models.export import _InferenceWrapper
+
+    sess = ort.InferenceSession(str(path), providers=["CPUExecutionProvider"])
+    # Batch size and number of frames differ from the traced ones
+    for B, T in [(1, 10), (2, 23)]:
+        x = torch.rand(B, T, in_dim)
+        lengths = torch.full((B,), T, dtype=torch.long)
+        inputs = {"x": x.numpy(), "lengths": lengths.numpy()}
+        feed = {i.name: inputs[i.name] for i in sess.get_inputs()}
+        out = sess.run(None, feed)[0]
+        model.eval()
+        with torch.no_grad():
+            expected = _InferenceWrapper(model)(x, lengths)
+        assert out.shape == expected.shape
+        assert torch.allclose(torch.from_numpy(out), expected, atol=1e-4)
+
+
+@pytest.mark.parametrize("mdn", [False, True])
+def test_export_onnx(tmp_path, mdn):
+    pytest.importorskip("onnx")
+    from nnsvs.acoustic_models.export import export_onnx
+
+    model = _make_npss_multistream_parametric_model(
+        mdn=mdn, lf0_model=_make_lf0_model(use_mdn=mdn, num_gaussians=2)
+    )
+    path = tmp_path / "acoustic.onnx"
+    export_onnx(model, str(path), num_frames=10)
+    assert path.exists()
+    assert model.training
+
+    _check_exported_onnx(model, path)
+
+
+class _BakedBatchSizeModel(torch.nn.Module):
+    def __init__(self, in_dim):
+        super().__init__()
+        self.in_dim = in_dim
+        self.proj = torch.nn.Linear(in_dim, in_dim)
+
+    def inference(self, x, lengths=None):
+        # len() is traced as a constant
+        return self.proj(x).reshape(len(x), -1, self.in_dim)
+
+
+def test_export_onnx_check(tmp_path):
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    from nnsvs.acoustic_models.export import export_onnx
+
+    model = _BakedBatchSizeModel(4)
+    path = tmp_path / "acoustic.onnx"
+    with pytest.raises(RuntimeError):
+        export_onnx(model, str(path), num_frames=10)
+    export_onnx(model, str(path), num_frames=10, check=False)
+    assert path.exists()
+
+
+def test_export_onnx_reduction_factor(tmp_path):
+    pytest.importorskip("onnx")
+    from nnsvs.acoustic_models.export import export_onnx
+
+    model = _make_multistream_parametric_model(reduction_factor=2)
+    path = tmp_path / "acoustic.onnx"
+    # The number of frames must be a multiple of the reduction factor
+    with pytest.raises(AssertionError):
+        export_onnx(model, str(path), num_frames=11)
+    export_onnx(model, str(path), num_frames=10)
+    assert path.exists()